@@ -4,5 +4,7 @@
 # License           : MIT license <Check LICENSE>
 # Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
 # Date              : 25.10.2024
-# Last Modified Date: 25.10.2024
+# Last Modified Date: 18.10.2026
 from .waves import waveform
+from .query import trace
+from .decoders import decoder, ahb_decoder
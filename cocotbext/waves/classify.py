@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : classify.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+
+# Drops the resolved bits, whatever is left is X/Z (or U, W from VHDL)
+_RESOLVED = str.maketrans("", "", "01")
+_HIGH_Z = frozenset("zZ")
+# VHDL weak and don't care values resolve as cocotb does (L, - to 0, H to 1)
+_WEAK = str.maketrans("-lLhH", "00011")
+
+
+def classify(binstrs):
+    # One (wave char, data label) per binary string of a batch of changed
+    # signals, a single pass over the joined batch tells when all of them
+    # are resolved, which is the common case
+    if not "".join(binstrs).translate(_RESOLVED):
+        return [_resolved(binstr) for binstr in binstrs]
+    values = []
+    for binstr in binstrs:
+        binstr = binstr.translate(_WEAK)
+        if binstr.translate(_RESOLVED):
+            values.append(_unresolved(binstr))
+        else:
+            values.append(_resolved(binstr))
+    return values
+
+
+def resolved(binstr):
+    # Integer value or None when any bit is X/Z
+    binstr = binstr.translate(_WEAK)
+    if binstr.translate(_RESOLVED):
+        return None
+    return int(binstr, 2)
+
+
+def _resolved(binstr):
+    if len(binstr) == 1:
+        return binstr, None
+    return None, hex(int(binstr, 2))
+
+
+def _unresolved(binstr):
+    unknown = binstr.translate(_RESOLVED)
+    if len(unknown) == len(binstr):
+        # Every bit unknown, drawn as a plain x/z lane
+        return "z" if set(unknown) <= _HIGH_Z else "x", None
+
+    # Partially unknown buses keep the resolved nibbles, e.g. 0xXX12
+    # Padded with the top bit, so an unknown top nibble stays unknown
+    fill = "0" if binstr[0] in "01" else binstr[0]
+    binstr = binstr.rjust(-(-len(binstr) // 4) * 4, fill)
+    digits = []
+    for pos in range(0, len(binstr), 4):
+        nibble = binstr[pos : pos + 4]
+        if not nibble.translate(_RESOLVED):
+            digits.append("%x" % int(nibble, 2))
+        elif not nibble.strip("zZ"):
+            digits.append("Z")
+        else:
+            digits.append("X")
+    return None, "0x" + "".join(digits)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : decoders.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 18.10.2026
+# Last Modified Date: 18.10.2026
+
+_AHB_RESP = {0: "OKAY", 1: "ERROR", 2: "RETRY", 3: "SPLIT"}
+
+
+class decoder:
+    # Base of the protocol decoders used by waveform.add_decoder(), decode()
+    # is called once per sample with the values of the group signals
+    # (name -> int, None when not resolvable) and returns the label of each
+    # lane where a transaction is shown on that sample, others go idle
+    lanes = []
+
+    def decode(self, values):
+        return {}
+
+
+class ahb_decoder(decoder):
+    # AHB / AHB-lite transfers, one label per completed data phase
+    lanes = ["txn", "data"]
+
+    def __init__(self, prefix: str = "") -> None:
+        self.prefix = prefix  # e.g. "s0_" for s0_haddr, s0_htrans...
+        self.pending = None  # Address phase waiting for its data phase
+
+    def _get(self, values, name, default=None):
+        return values.get(self.prefix + name, default)
+
+    def decode(self, values):
+        labels = {}
+        if self._get(values, "hready") != 1:
+            # Wait states (or unknown hready) keep both phases where they are
+            return labels
+
+        if self.pending is not None:
+            write, addr, size = self.pending
+            resp = self._get(values, "hresp", 0)
+            data = self._get(values, "hwdata" if write else "hrdata")
+            labels["txn"] = "{} {} {} {}".format(
+                {1: "WR", 0: "RD"}.get(write, "??"),
+                "0x?" if addr is None else hex(addr),
+                "?B" if size is None else f"{1 << size}B",
+                _AHB_RESP.get(resp, "x"),
+            )
+            labels["data"] = "x" if data is None else hex(data)
+            self.pending = None
+
+        # NONSEQ/SEQ accepted on this cycle move to the data phase on the next
+        selected = self._get(values, "hsel", 1) == 1
+        if selected and self._get(values, "htrans") in (2, 3):
+            self.pending = (
+                self._get(values, "hwrite"),
+                self._get(values, "haddr"),
+                self._get(values, "hsize"),
+            )
+        return labels
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : query.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 18.10.2026
+# Last Modified Date: 19.10.2026
+import json
+import re
+import bisect
+
+# Wave chars carrying a data label in wavedrom
+_DATA_CHARS = "=23456789"
+
+
+def _value(char, label):
+    # Integers for resolved values, wave char (x, z, P...) or raw label else
+    if label is not None:
+        try:
+            return int(label, 16)
+        except ValueError:
+            return label
+    if char in "01":
+        return int(char)
+    return char
+
+
+class signal_index:
+    def __init__(self, name, times, values, end) -> None:
+        self.name = name
+        self.times = times  # Cycle of every change, sorted
+        self.values = values  # Value from each change on
+        self.end = end  # Cycle where the lane ends
+        self.by_value = {}  # Value -> indexes of the changes to it
+        for index, value in enumerate(values):
+            self.by_value.setdefault(value, []).append(index)
+
+    def _until(self, index):
+        return self.times[index + 1] if index + 1 < len(self.times) else self.end
+
+    def value_at(self, cycle):
+        index = bisect.bisect_right(self.times, cycle) - 1
+        if index < 0 or cycle >= self.end:
+            return None
+        return self.values[index]
+
+    def ranges(self, value):
+        ranges = []
+        for index in self.by_value.get(value, []):
+            start, end = self.times[index], self._until(index)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], end)
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def changes(self, start=None, end=None):
+        lo = 0 if start is None else bisect.bisect_left(self.times, start)
+        hi = len(self.times) if end is None else bisect.bisect_left(self.times, end)
+        return list(zip(self.times[lo:hi], self.values[lo:hi]))
+
+    def edges(self, rising=True):
+        # 0 -> 1 (or 1 -> 0) transitions, looked up through the value index
+        before, after = (0, 1) if rising else (1, 0)
+        return [
+            self.times[index]
+            for index in self.by_value.get(after, [])
+            if index > 0 and self.values[index - 1] == before
+        ]
+
+
+class trace:
+    def __init__(self, lanes) -> None:
+        # lanes: [(group path, signal_index)], addressed by path ("G/name") or
+        # by name when it is not shared by lanes of different groups
+        self.signals = {}
+        self.ambiguous = {}  # Shared name -> paths of the lanes using it
+        paths = {}
+        for path, lane in lanes:
+            self.signals[path] = lane
+            paths.setdefault(lane.name, []).append(path)
+        for name, found in paths.items():
+            if name in self.signals:
+                continue
+            if len(found) == 1:
+                self.signals[name] = self.signals[found[0]]
+            else:
+                self.ambiguous[name] = found
+
+    @classmethod
+    def load(cls, path):
+        # Rebuilds the indexes from a wavedrom file written by save_txt()
+        with open(path) as file:
+            waves = json.load(file)
+        hscale = waves.get("config", {}).get("hscale", 1)
+        return cls(cls._parse(waves["signal"], "", hscale))
+
+    @classmethod
+    def _parse(cls, items, prefix, hscale):
+        lanes = []
+        for item in items:
+            if isinstance(item, list):
+                lanes += cls._parse(item[1:], prefix + str(item[0]) + "/", hscale)
+                continue
+            if not isinstance(item, dict) or "wave" not in item:
+                continue
+
+            period = item.get("period", 1)
+            offset = -item.get("phase", 0) / hscale
+            labels = item.get("data", [])
+            if isinstance(labels, str):
+                labels = labels.split()
+            labels = iter(labels)
+
+            times, values = [], []
+            for pos, char in enumerate(item["wave"]):
+                if char in ".|":
+                    continue
+                label = next(labels, None) if char in _DATA_CHARS else None
+                times.append(round(offset + pos * period, 6))
+                values.append(_value(char, label))
+
+            name = re.sub(r"\[\d+:0\]$", "", item["name"])
+            end = round(offset + len(item["wave"]) * period, 6)
+            lanes.append((prefix + name, signal_index(name, times, values, end)))
+        return lanes
+
+    def __getitem__(self, name):
+        if name in self.ambiguous:
+            raise KeyError(
+                f"{name} is used by {', '.join(self.ambiguous[name])}, "
+                "address it by its group path"
+            )
+        return self.signals[name]
+
+    def value_at(self, name, cycle):
+        return self[name].value_at(cycle)
+
+    def where(self, name, value):
+        return self[name].ranges(value)
+
+    def changes(self, name, start=None, end=None):
+        return self[name].changes(start, end)
+
+    def edges(self, name, rising=True, start=None, end=None):
+        edges = self[name].edges(rising)
+        lo = 0 if start is None else bisect.bisect_left(edges, start)
+        hi = len(edges) if end is None else bisect.bisect_left(edges, end)
+        return edges[lo:hi]
+
+    def when(self, conditions=None, **kwargs):
+        # Cycle ranges where every signal matches, values can be a set/list.
+        # Group paths go in the conditions mapping, e.g. {"AHB/haddr": 0x10}
+        conditions = dict(conditions or {}, **kwargs)
+        result = None
+        for name, value in conditions.items():
+            if isinstance(value, (set, frozenset, list, tuple)):
+                ranges = sorted(r for v in value for r in self.where(name, v))
+            else:
+                ranges = self.where(name, value)
+            result = ranges if result is None else _overlap(result, ranges)
+            if not result:
+                return []
+        return result or []
+
+
+def _overlap(left, right):
+    # Intersection of two sorted lists of [start, end) ranges
+    result = []
+    i = j = 0
+    while i < len(left) and j < len(right):
+        start = max(left[i][0], right[j][0])
+        end = min(left[i][1], right[j][1])
+        if start < end:
+            result.append((start, end))
+        if left[i][1] < right[j][1]:
+            i += 1
+        else:
+            j += 1
+    return result
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : viewer.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 18.10.2026
+# Last Modified Date: 18.10.2026
+import json
+import html
+import re
+
+# Single file viewer, only the lanes and cycles inside the window are drawn
+# on every scroll/zoom so huge captures stay responsive in the browser
+_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>__TITLE__</title>
+<style>
+body { margin: 0; font: 12px monospace; color: #222; display: flex;
+       flex-direction: column; height: 100vh; }
+#bar { padding: 4px 8px; border-bottom: 1px solid #ccc; display: flex;
+       gap: 8px; align-items: center; }
+#view { position: relative; flex: 1; overflow: hidden; }
+#scroll { position: absolute; inset: 0; overflow: auto; }
+#space { width: 1px; height: 1px; }
+canvas { position: absolute; left: 0; top: 0; pointer-events: none; }
+</style>
+</head>
+<body>
+<div id="bar">
+<b>__TITLE__</b>
+<input id="search" placeholder="search signal">
+<input id="jump" type="number" placeholder="cycle" style="width: 90px">
+<button id="go">go</button>
+<button id="zin">+</button><button id="zout">-</button><button id="fit">fit</button>
+<span id="info"></span>
+</div>
+<div id="view"><canvas id="cv"></canvas><div id="scroll"><div id="space"></div></div></div>
+<script type="application/json" id="data">__DATA__</script>
+<script>
+"use strict";
+const D = JSON.parse(document.getElementById("data").textContent);
+const ROW = 24, NAMES = 240, TOP = 20, MAXPX = 8000000;
+const COLORS = {"2": "#ffffff", "3": "#ffffb4", "4": "#ffe0b9", "5": "#b9e0ff",
+                "6": "#ccfdfe", "7": "#cdfdc5", "8": "#f0c1fb", "9": "#f5c2c0"};
+const cv = document.getElementById("cv"), ctx = cv.getContext("2d");
+const sc = document.getElementById("scroll"), sp = document.getElementById("space");
+let ppc = 20, rows = D.lanes, cursor = null, pending = false;
+
+function lastLE(a, v) {
+  let lo = 0, hi = a.length - 1, r = -1;
+  while (lo <= hi) {
+    const m = (lo + hi) >> 1;
+    if (a[m] <= v) { r = m; lo = m + 1; } else { hi = m - 1; }
+  }
+  return r;
+}
+
+function widthPx() { return Math.max(D.cycles * ppc, 1); }
+function ratio() { return widthPx() / Math.min(widthPx(), MAXPX); }
+function firstCycle() { return sc.scrollLeft * ratio() / ppc; }
+function setFirstCycle(c) { sc.scrollLeft = Math.max(c, 0) * ppc / ratio(); }
+function span() { return (sc.clientWidth - NAMES) / ppc; }
+
+function layout() {
+  sp.style.width = (NAMES + Math.min(widthPx(), MAXPX)) + "px";
+  sp.style.height = (TOP + rows.length * ROW) + "px";
+  draw();
+}
+
+function schedule() {
+  if (!pending) { pending = true; requestAnimationFrame(() => { pending = false; draw(); }); }
+}
+
+function segment(tok, label, xa, xb, hi, lo, period) {
+  const mid = (hi + lo) / 2;
+  ctx.strokeStyle = "#000";
+  if (tok === "0" || tok === "1") {
+    const y = tok === "1" ? hi : lo;
+    ctx.beginPath(); ctx.moveTo(xa, hi); ctx.lineTo(xa, lo);
+    ctx.moveTo(xa, y); ctx.lineTo(xb, y); ctx.stroke();
+  } else if (tok === "z") {
+    ctx.strokeStyle = "#00f";
+    ctx.beginPath(); ctx.moveTo(xa, mid); ctx.lineTo(xb, mid); ctx.stroke();
+  } else if (tok === "x") {
+    ctx.fillStyle = "#ddd"; ctx.fillRect(xa, hi, xb - xa, lo - hi);
+    ctx.strokeRect(xa, hi, xb - xa, lo - hi);
+  } else if (tok === "P" || tok === "N") {
+    const step = period * ppc, half = step / 2;
+    if (half < 2) {
+      ctx.fillStyle = "#888"; ctx.fillRect(xa, hi, xb - xa, lo - hi);
+      return;
+    }
+    const from = Math.max(xa, NAMES - step), to = Math.min(xb, sc.clientWidth);
+    let x = xa + Math.floor((from - xa) / step) * step;
+    ctx.beginPath();
+    for (; x < to; x += step) {
+      const a = tok === "P" ? hi : lo, b = tok === "P" ? lo : hi;
+      ctx.moveTo(x, b); ctx.lineTo(x, a); ctx.lineTo(x + half, a);
+      ctx.lineTo(x + half, b); ctx.lineTo(Math.min(x + step, xb), b);
+    }
+    ctx.stroke();
+  } else {
+    ctx.fillStyle = COLORS[tok] || "#fff";
+    ctx.beginPath(); ctx.moveTo(xa, mid); ctx.lineTo(xa + 3, hi);
+    ctx.lineTo(xb - 3, hi); ctx.lineTo(xb, mid); ctx.lineTo(xb - 3, lo);
+    ctx.lineTo(xa + 3, lo); ctx.closePath(); ctx.fill(); ctx.stroke();
+    if (label !== null) {
+      const x0 = Math.max(xa, NAMES) + 4, x1 = Math.min(xb, sc.clientWidth) - 4;
+      if (ctx.measureText(label).width < x1 - x0) {
+        ctx.fillStyle = "#000"; ctx.fillText(label, (x0 + x1) / 2, mid);
+      }
+    }
+  }
+}
+
+function drawLane(l, y, c0, c1) {
+  const dm = D.domains[l.domain], p = dm.period, off = dm.offset;
+  const X = s => NAMES + (off + s * p - c0) * ppc;
+  const s0 = (c0 - off) / p, s1 = (c1 - off) / p;
+  const hi = y + 4, lo = y + ROW - 4;
+  let i = Math.max(lastLE(l.s, s0), 0);
+  while (i < l.s.length && l.s[i] <= s1) {
+    const end = i + 1 < l.s.length ? l.s[i + 1] : dm.length;
+    const xa = X(l.s[i]), xb = X(end);
+    if (xb - xa < 1 && i + 1 < l.s.length) {
+      // Changes closer than a pixel are drawn as a single busy block
+      const j = lastLE(l.s, l.s[i] + 2 / (ppc * p));
+      ctx.fillStyle = "#888"; ctx.fillRect(xa, hi, X(l.s[j]) - xa, lo - hi);
+      i = j;
+      continue;
+    }
+    segment(l.w[i], l.d[i], xa, xb, hi, lo, p);
+    i++;
+  }
+  ctx.strokeStyle = "#c00";
+  for (const g of dm.gaps) {
+    if (g < s0 - 1 || g > s1) { continue; }
+    const x = X(g);
+    ctx.beginPath(); ctx.moveTo(x - 2, lo + 2); ctx.lineTo(x + 2, hi - 2);
+    ctx.moveTo(x + 2, lo + 2); ctx.lineTo(x + 6, hi - 2); ctx.stroke();
+  }
+}
+
+function draw() {
+  const W = sc.clientWidth, H = sc.clientHeight, dpr = window.devicePixelRatio || 1;
+  cv.width = W * dpr; cv.height = H * dpr;
+  cv.style.width = W + "px"; cv.style.height = H + "px";
+  ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+  ctx.clearRect(0, 0, W, H);
+  ctx.font = "11px monospace"; ctx.textAlign = "center"; ctx.textBaseline = "middle";
+  ctx.lineWidth = 1;
+
+  const c0 = firstCycle(), c1 = c0 + span();
+  const r0 = Math.floor(sc.scrollTop / ROW), r1 = Math.min(rows.length, r0 + Math.ceil(H / ROW) + 1);
+
+  ctx.save(); ctx.beginPath(); ctx.rect(NAMES, 0, W - NAMES, H); ctx.clip();
+  // Ruler ticks at 1/2/5 multiples, at least 60px apart
+  const raw = 60 / ppc, mag = Math.pow(10, Math.floor(Math.log10(raw)));
+  const step = [1, 2, 5, 10].map(m => m * mag).find(v => v >= raw);
+  ctx.strokeStyle = "#eee"; ctx.fillStyle = "#666";
+  for (let c = Math.floor(c0 / step) * step; c <= c1; c += step) {
+    const x = NAMES + (c - c0) * ppc;
+    ctx.beginPath(); ctx.moveTo(x, TOP); ctx.lineTo(x, H); ctx.stroke();
+    ctx.fillText(String(Math.round(c * 100) / 100), x, TOP / 2);
+  }
+  for (let r = r0; r < r1; r++) { drawLane(rows[r], TOP + (r - r0) * ROW, c0, c1); }
+  if (cursor !== null) {
+    const x = NAMES + (cursor - c0) * ppc;
+    ctx.strokeStyle = "#f00"; ctx.beginPath(); ctx.moveTo(x, 0); ctx.lineTo(x, H); ctx.stroke();
+  }
+  ctx.restore();
+
+  ctx.fillStyle = "#f4f4f4"; ctx.fillRect(0, TOP, NAMES, H);
+  ctx.fillStyle = "#000"; ctx.textAlign = "left";
+  for (let r = r0; r < r1; r++) { ctx.fillText(rows[r].name, 4, TOP + (r - r0) * ROW + ROW / 2, NAMES - 8); }
+
+  document.getElementById("info").textContent =
+    "cycles " + c0.toFixed(1) + " - " + c1.toFixed(1) + " of " + D.cycles.toFixed(1) +
+    ", " + rows.length + "/" + D.lanes.length + " signals";
+}
+
+function zoom(factor, at) {
+  const c = firstCycle() + at / ppc;
+  ppc = Math.min(Math.max(ppc * factor, 1e-4), 400);
+  layout();
+  setFirstCycle(c - at / ppc);
+  draw();
+}
+
+sc.addEventListener("scroll", schedule);
+sc.addEventListener("wheel", e => {
+  if (!e.ctrlKey) { return; }
+  e.preventDefault();
+  zoom(e.deltaY < 0 ? 1.25 : 0.8, Math.max(e.offsetX - NAMES, 0));
+}, {passive: false});
+window.addEventListener("resize", layout);
+document.getElementById("zin").onclick = () => zoom(2, span() * ppc / 2);
+document.getElementById("zout").onclick = () => zoom(0.5, span() * ppc / 2);
+document.getElementById("fit").onclick = () => {
+  ppc = Math.max((sc.clientWidth - NAMES) / Math.max(D.cycles, 1), 1e-4);
+  layout(); setFirstCycle(0);
+};
+document.getElementById("search").oninput = e => {
+  const q = e.target.value.toLowerCase();
+  rows = D.lanes.filter(l => l.name.toLowerCase().includes(q));
+  sc.scrollTop = 0;
+  layout();
+};
+const jump = () => {
+  const c = parseFloat(document.getElementById("jump").value);
+  if (isNaN(c)) { return; }
+  cursor = c;
+  setFirstCycle(c - span() / 2);
+  draw();
+};
+document.getElementById("go").onclick = jump;
+document.getElementById("jump").onkeydown = e => { if (e.key === "Enter") { jump(); } };
+layout();
+</script>
+</body>
+</html>
+"""
+
+
+def render_html(title, data):
+    # "</" is escaped so signal names can never close the script tag
+    payload = json.dumps(data, separators=(",", ":")).replace("</", "<\\/")
+    fields = {"TITLE": html.escape(title), "DATA": payload}
+    return re.sub("__(TITLE|DATA)__", lambda m: fields[m.group(1)], _TEMPLATE)
@@ -4,17 +4,84 @@
 # License           : MIT license <Check LICENSE>
 # Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
 # Date              : 25.10.2024
-# Last Modified Date: 01.11.2024
+# Last Modified Date: 19.10.2026
 import cocotb
 import wavedrom
 import json
-import copy
 import logging
 import datetime
+import fnmatch
+import re
+import bisect
+import weakref
+import math
+import io
+import heapq
+import itertools
 
 from .version import __version__
-from cocotb.handle import SimHandleBase
+from .viewer import render_html
+from .query import trace, signal_index, _value
+from .classify import classify, resolved
+from cocotb.handle import (
+    SimHandleBase,
+    RegionObject,
+    ModifiableObject,
+    RealObject,
+    EnumObject,
+    IntegerObject,
+    StringObject,
+)
 from cocotb.triggers import RisingEdge, FallingEdge
+from cocotb.utils import get_sim_time
+
+# Signal types without a logic vector value, not drawn by the waveform
+_NON_LOGIC_OBJECTS = (RealObject, EnumObject, IntegerObject, StringObject)
+
+# Rough CPython cost of the sample store used for the memory budget, a
+# timestamp (int + list slot) per sample and a tuple per signal change
+_SAMPLE_BYTES = 40
+_CHANGE_BYTES = 120
+
+_OVERFLOW_MODES = ("stop", "head", "tail", "spill")
+
+# Size of the pieces written by the streaming serializer
+_CHUNK = 65536
+
+# Largest hscale taken by wavedrom, tolerance of the window arithmetic
+_MAX_HSCALE = 100
+_EPS = 1e-9
+
+
+def _binstr(handle):
+    # Raw binary string of the simulator, skips building a BinaryValue
+    return handle._handle.get_signal_val_binstr()
+
+
+def _num(value):
+    # Cycle numbers, integral ones printed without decimals
+    value = round(value, 6)
+    return int(value) if float(value).is_integer() else value
+
+
+class _chunk_writer:
+    # Groups the small writes of the serializer into _CHUNK sized ones
+    def __init__(self, write) -> None:
+        self.write = write
+        self.buf = []
+        self.size = 0
+
+    def __call__(self, data):
+        self.buf.append(data)
+        self.size += len(data)
+        if self.size >= _CHUNK:
+            self.flush()
+
+    def flush(self):
+        if self.buf:
+            self.write("".join(self.buf))
+            self.buf = []
+            self.size = 0
 
 
 class signal_data:
@@ -28,6 +95,10 @@ class signal_data:
         previous_val=None,
         clock_period=1,
         group=None,
+        entry=None,
+        width=1,
+        domain=None,
+        path=None,
     ) -> None:
         self.name = name
         self.handle = handle
@@ -37,9 +108,80 @@ class signal_data:
         self.previous_val = previous_val
         self.clock_period = clock_period
         self.group = group
+        self.entry = entry  # Lane dict in waveform.waves, keeps the diagram order
+        self.width = width
+        self.domain = domain
+        # Decoded lanes have no handle, their path is "group/lane"
+        self.path = path if path is not None else handle._path
+        # Sampled store, one (sample index, wave char, data label) per change
+        self.changes = []
+
+
+class clock_domain:
+    def __init__(self, clk, is_posedge=True) -> None:
+        self.clk = clk
+        self.is_posedge = is_posedge
+        self.signals = []  # List of [signal_data] sampled on this clock
+        self.timestamps = []  # Sim time (steps) of the active edge per sample
+        self.dropped = 0  # Samples trimmed from the head of timestamps
+        self.declared = False  # Edge set by the clock's own registration
+        self.decoders = []  # List of [decoded_group] fed on this clock
+        self.mon = None
+
+    def lanes(self):
+        # Every lane with changes in the store, sampled and decoded ones
+        yield from self.signals
+        for group in self.decoders:
+            yield from group.lanes
+
+    @property
+    def period(self):
+        # Smallest distance between samples, gaps are multiples of it
+        if len(self.timestamps) < 2:
+            return None
+        return min(b - a for a, b in zip(self.timestamps, self.timestamps[1:]))
+
+    def slots(self, period):
+        # Position of every sample in its own clock cycles since the first one
+        if period is None:
+            return range(len(self.timestamps))
+        return sample_slots(self.timestamps, period)
+
+
+class sample_slots:
+    # Read-only sequence of sample slots, derived from the timestamps on
+    # access so exports do not hold a list as long as the capture
+    def __init__(self, timestamps, period) -> None:
+        self.timestamps = timestamps
+        self.period = period
+        self.first = timestamps[0] if timestamps else 0
+        self.count = len(timestamps)  # Samples taken after this are not seen
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("sample slot out of range")
+        offset = self.timestamps[index] - self.first
+        return (offset + self.period // 2) // self.period
+
+
+class decoded_group:
+    def __init__(self, decoder, raw, lanes) -> None:
+        self.decoder = decoder
+        self.raw = raw  # List of [signal_data] read on every sample
+        self.lanes = lanes  # List of [signal_data], one per decoder lane
 
 
 class waveform:
+    # Budget shared by all waveforms, see set_global_budget()
+    global_max_cycles = None
+    global_max_mem = None
+    _live = weakref.WeakSet()
+
     def __init__(
         self,
         clk,
@@ -48,8 +190,17 @@ class waveform:
         is_posedge: bool = True,
         debug: bool = False,
         start: bool = True,
+        max_cycles=None,
+        max_mem=None,
+        overflow: str = "stop",
     ) -> None:
+        if overflow not in _OVERFLOW_MODES:
+            raise ValueError(
+                f"Invalid overflow mode {overflow}, expected one of {_OVERFLOW_MODES}"
+            )
+
         self.handles = []  # List to store [signal_data] obj
+        self._registered = set()  # Paths of registered handles
         self.waves = {}
         self.waves["signal"] = []
         self.trigger = {"trigger": None, "value": 0}
@@ -65,6 +216,22 @@ class waveform:
         self.clk = clk
         self.name = name
         self.color_idx = 3  # Start color for multi-bit signal
+        self.domains = {}  # Clock path -> [clock_domain], main clock first
+
+        self.max_cycles = max_cycles
+        self.max_mem = max_mem  # Bytes, estimated from the sample store
+        self.overflow = overflow
+        self.cycles = 0  # Samples held, summed across clock domains
+        self.mem = 0
+        self.dropped = 0  # Samples lost or spilled because of the budget
+        self.truncated = False
+        waveform._live.add(self)
+
+        self.grid, self._origin, self._base = {}, None, None
+        self._hscale = hscale  # Scaled so every clock domain fits wavedrom
+        # Sim time where the previous snapshot ended, and whether it ended
+        # after the sample taken at that time
+        self._snap = None
 
         self.add_signal(clk, color=None, is_clock=True, is_posedge_clock=is_posedge)
 
@@ -79,6 +246,11 @@ class waveform:
         if start:
             self.start()
 
+    @classmethod
+    def set_global_budget(cls, max_cycles=None, max_mem=None):
+        cls.global_max_cycles = max_cycles
+        cls.global_max_mem = max_mem
+
     def add_trigger(self, handle, val):
         self.trigger = {"trigger": handle, "value": val}
 
@@ -90,6 +262,7 @@ class waveform:
         is_posedge_clock: bool = True,
         clock_period=1,
         group=None,
+        clk=None,
     ):
         if not isinstance(sig, list):
             sig = [sig]
@@ -97,205 +270,429 @@ class waveform:
         sig_list = []
 
         for signal in sig:
-            if signal.__len__() == 1:
-                sig_list.append(
-                    {
-                        "name": signal._name,
-                        "wave": "",
-                    }
+            sig_list.append(
+                self._new_lane(
+                    signal, color, is_clock, is_posedge_clock, clock_period, group, clk
                 )
+            )
+
+        if group is not None:
+            self.waves["signal"].append([group] + sig_list)
+        else:
+            for item in sig_list:
+                self.waves["signal"].append(item)
+
+    def add_hierarchy(
+        self,
+        root,
+        pattern: str = "*",
+        regex: bool = False,
+        recursive: bool = True,
+        group=True,
+        color=None,
+        clk=None,
+    ):
+        # Names relative to root (e.g. "u_alu.result") are filtered by a glob
+        # pattern or a regex, each scope becomes a nested wavedrom group
+        if regex:
+            match = re.compile(pattern).search
+        else:
+            match = re.compile(fnmatch.translate(pattern)).match
 
-                self.handles.append(
-                    signal_data(
-                        name=signal._name,
-                        handle=signal,
-                        is_clock=is_clock,
-                        is_posedge_clock=is_posedge_clock,
-                        clock_period=clock_period,
-                        group=group,
+        if hasattr(root, "_signals") and isinstance(root._signals, dict):
+            # cocotb-bus objects, name taken from the bus itself
+            name = getattr(root, "name", None) or getattr(root, "_name", None)
+            children = list(root._signals.values())
+        else:
+            name = root._name
+            children = root
+
+        if isinstance(group, str):
+            name = group
+
+        top = [name] if group else []
+        # Iterative walk, keeps deep hierarchies away from the recursion limit
+        stack = [(children, top, "", name)]
+        while stack:
+            children, lanes, prefix, scope = stack.pop()
+
+            for child in children:
+                if isinstance(child, RegionObject):
+                    if recursive:
+                        sub_lanes = [child._name] if group else lanes
+                        if group:
+                            lanes.append(sub_lanes)
+                        stack.append(
+                            (child, sub_lanes, prefix + child._name + ".", child._name)
+                        )
+                    continue
+
+                if not isinstance(child, ModifiableObject) or isinstance(
+                    child, _NON_LOGIC_OBJECTS
+                ):
+                    continue
+
+                if child._path in self._registered:
+                    continue
+
+                if match(prefix + child._name) is None:
+                    continue
+
+                lanes.append(
+                    self._new_lane(
+                        child, color, False, True, 1, scope if group else None, clk
                     )
                 )
-            else:
-                sig_list.append(
-                    {
-                        "name": signal._name,
-                        "wave": "",
-                        "data": "",
-                    }
-                )
 
-                if color is None:
-                    # Automatically assigns a color
-                    if self.color_idx == 9:
-                        color_tmp = 3
-                    else:
-                        color_tmp = self.color_idx
-                        self.color_idx = color_tmp + 1
-                else:
-                    # Take user's input
-                    color_tmp = color
-
-                # Append to the list that will be used later
-                self.handles.append(
-                    signal_data(
-                        name=signal._name,
-                        handle=signal,
-                        color_data=str(color_tmp),
-                        is_clock=is_clock,
-                        is_posedge_clock=is_posedge_clock,
-                        clock_period=clock_period,
-                        group=group,
+        if group:
+            self._prune_groups(top)
+            if len(top) > 1:
+                self.waves["signal"].append(top)
+        else:
+            self.waves["signal"].extend(top)
+
+    def _prune_groups(self, lanes):
+        # Drops scopes where nothing matched the filter
+        lanes[1:] = [
+            item
+            for item in lanes[1:]
+            if not isinstance(item, list) or self._prune_groups(item)
+        ]
+        return len(lanes) > 1
+
+    def _domain(self, clk, is_posedge, declared=False):
+        # Domains created through clk= take the main clock edge until the
+        # clock itself is registered with is_clock=True
+        if clk._path not in self.domains:
+            domain = clock_domain(clk, is_posedge)
+            self.domains[clk._path] = domain
+            if self._start:
+                domain.mon = cocotb.start_soon(self._monitor(domain))
+        domain = self.domains[clk._path]
+
+        if declared and not domain.declared:
+            if domain.is_posedge != is_posedge:
+                if domain.timestamps:
+                    raise ValueError(
+                        f"Clock {clk._path} already sampled on the other edge, "
+                        "register it with is_clock=True before using it in clk="
                     )
+                domain.is_posedge = is_posedge
+                if domain.mon is not None:
+                    domain.mon.kill()
+                    domain.mon = cocotb.start_soon(self._monitor(domain))
+            domain.declared = True
+        elif declared and domain.is_posedge != is_posedge:
+            raise ValueError(
+                f"Clock {clk._path} registered with both edges, "
+                f"expected is_posedge_clock={domain.is_posedge}"
+            )
+        return domain
+
+    def _new_lane(
+        self, signal, color, is_clock, is_posedge_clock, clock_period, group, clk=None
+    ):
+        width = signal.__len__()
+
+        # Clocks are sampled on their own edges, other signals on clk
+        if clk is not None:
+            domain = self._domain(clk, self.is_posedge)
+        elif is_clock:
+            domain = self._domain(signal, is_posedge_clock, declared=True)
+        else:
+            domain = self._domain(self.clk, self.is_posedge)
+
+        # Only the lane name lives in self.waves, waves come from the store
+        entry = {"name": signal._name}
+
+        if width == 1:
+            color_data = None
+        else:
+            color_data = self._color(color)
+
+        # Append to the list that will be used later
+        self.handles.append(
+            signal_data(
+                name=signal._name,
+                handle=signal,
+                color_data=color_data,
+                is_clock=is_clock,
+                is_posedge_clock=is_posedge_clock,
+                clock_period=clock_period,
+                group=group,
+                entry=entry,
+                width=width,
+                domain=domain,
+            )
+        )
+        domain.signals.append(self.handles[-1])
+        self._registered.add(signal._path)
+        return entry
+
+    def _color(self, color):
+        if color is None:
+            # Automatically assigns a color
+            if self.color_idx == 9:
+                color_tmp = 3
+            else:
+                color_tmp = self.color_idx
+                self.color_idx = color_tmp + 1
+        else:
+            # Take user's input
+            color_tmp = color
+
+        return str(color_tmp)
+
+    def add_decoder(self, group, decoder, keep_raw: bool = False, color=None):
+        # Collapses a registered group into the lanes of a protocol decoder
+        # (see decoders.py), the raw lanes are only stored and drawn as a
+        # "raw" sub-group when keep_raw is set
+        items = self._find_group(self.waves["signal"], group)
+        if items is None:
+            raise ValueError(f"Group {group} not found in waveform {self.name}")
+
+        entries = [entry for _, entry in self._flat_lanes(items[1:], "")]
+        by_entry = {id(signal.entry): signal for signal in self.handles}
+        raw = [by_entry[id(entry)] for entry in entries]
+        if not raw:
+            raise ValueError(f"Group {group} has no lanes to decode")
+        if any(signal.handle is None for signal in raw):
+            raise ValueError(f"Group {group} has lanes already decoded")
+        if len({id(signal.domain) for signal in raw}) > 1:
+            raise ValueError(
+                f"Group {group} has lanes sampled on more than one clock domain"
+            )
+        domain = raw[0].domain
+
+        lanes = []
+        for lane in decoder.lanes:
+            entry = {"name": lane}
+            lanes.append(
+                signal_data(
+                    name=lane,
+                    handle=None,
+                    color_data=self._color(color),
+                    is_clock=False,
+                    is_posedge_clock=True,
+                    group=group,
+                    entry=entry,
+                    width=0,
+                    domain=domain,
+                    path=f"{group}/{lane}",
                 )
+            )
+        self.handles.extend(lanes)
+        domain.decoders.append(decoded_group(decoder, raw, lanes))
 
-        if group is not None:
-            self.waves["signal"].append([group] + sig_list)
+        decoded = [signal.entry for signal in lanes]
+        if keep_raw:
+            items[1:] = decoded + [["raw"] + items[1:]]
         else:
-            for item in sig_list:
-                self.waves["signal"].append(item)
+            # Read by the decoder only, nothing of them goes to the store
+            items[1:] = decoded
+            # Lists rebuilt once, large bus groups stay linear
+            removed = {id(signal) for signal in raw}
+            self.handles = [
+                signal for signal in self.handles if id(signal) not in removed
+            ]
+            for clk_domain in self.domains.values():
+                clk_domain.signals = [
+                    signal
+                    for signal in clk_domain.signals
+                    if id(signal) not in removed
+                ]
+            self.cycles, self.mem = self._usage()
+
+    def _find_group(self, items, group):
+        for item in items:
+            if isinstance(item, list):
+                if item[0] == group:
+                    return item
+                found = self._find_group(item[1:], group)
+                if found is not None:
+                    return found
+        return None
 
     def start(self):
         if self._start is False:
-            self.mon = cocotb.start_soon(self._monitor())
+            for domain in self.domains.values():
+                domain.mon = cocotb.start_soon(self._monitor(domain))
             self._start = True
             if self.debug:
                 print("[Waves - Debug] Starting sampling signals")
 
-    async def _monitor(self):
-        while True:
-            if self.is_posedge is True:
-                await RisingEdge(self.clk)
-                await FallingEdge(self.clk)
+    async def _monitor(self, domain):
+        while not (self.truncated and self.overflow == "stop"):
+            # Timestamp taken on the active edge, where the wavedrom cycle starts
+            if domain.is_posedge is True:
+                await RisingEdge(domain.clk)
+                timestamp = get_sim_time()
+                await FallingEdge(domain.clk)
             else:
-                await FallingEdge(self.clk)
-                await RisingEdge(self.clk)
+                await FallingEdge(domain.clk)
+                timestamp = get_sim_time()
+                await RisingEdge(domain.clk)
 
             if self.trigger["trigger"] is not None:
                 if self.trigger["trigger"].value == self.trigger["value"]:
-                    self._add_signals()
+                    self._add_signals(domain, timestamp)
             else:
-                self._add_signals()
-
-    def _add_signals(self):
-        for index, signal in enumerate(self.handles):
-            self._append_wave_dot(index, signal)
-
-    def _append_wave_dot(self, index, signal):
-        if signal.is_clock is True:
-            for entry in self.waves["signal"]:
-                if isinstance(entry, dict) and entry["name"] == signal.name:
-                    if signal.handle.value.is_resolvable is not True:
-                        if "z" in signal.handle.value:
-                            entry["wave"] += "z"
-                        else:
-                            entry["wave"] += "x"
-                    else:
-                        if entry["wave"] == "":
-                            entry["wave"] += "P" if signal.is_posedge_clock else "N"
-                            entry["period"] = signal.clock_period
-                        else:
-                            entry["wave"] += "."
-                elif isinstance(entry, list):
-                    for subentry in entry:
-                        if (
-                            isinstance(subentry, dict)
-                            and subentry.get("name") == signal.name
-                        ):
-                            if signal.handle.value.is_resolvable is not True:
-                                if "z" in signal.handle.value:
-                                    subentry["wave"] += "z"
-                                else:
-                                    subentry["wave"] += "x"
-                            else:
-                                if subentry["wave"] == "":
-                                    subentry["wave"] += (
-                                        "P" if signal.is_posedge_clock else "N"
-                                    )
-                                    subentry["period"] = signal.clock_period
-                                else:
-                                    subentry["wave"] += "."
-        else:
-            for entry in self.waves["signal"]:
-                if isinstance(entry, dict) and entry["name"] == signal.name:
-                    if entry["name"] == signal.name:
-                        if signal.previous_val is None:
-                            self.handles[index].previous_val = copy.deepcopy(
-                                signal.handle.value
-                            )
-
-                            if signal.handle.value.is_resolvable is not True:
-                                if "z" in signal.handle.value:
-                                    entry["wave"] += "z"
-                                else:
-                                    entry["wave"] += "x"
-                            else:
-                                if signal.handle.__len__() > 1:
-                                    entry["data"] += str(hex(signal.handle.value)) + " "
-                                    entry["wave"] += signal.color_data
-                                else:
-                                    entry["wave"] += str(signal.handle.value)
-                        elif signal.handle.value == signal.previous_val:
-                            entry["wave"] += "."
-                        else:
-                            self.handles[index].previous_val = copy.deepcopy(
-                                signal.handle.value
-                            )
-
-                            if signal.handle.value.is_resolvable is not True:
-                                if "z" in signal.handle.value:
-                                    entry["wave"] += "z"
-                                else:
-                                    entry["wave"] += "x"
-                            else:
-                                if signal.handle.__len__() > 1:
-                                    entry["wave"] += signal.color_data
-                                    entry["data"] += str(hex(signal.handle.value)) + " "
-                                else:
-                                    entry["wave"] += str(signal.handle.value)
-                elif isinstance(entry, list):
-                    for subentry in entry:
-                        if (
-                            isinstance(subentry, dict)
-                            and subentry.get("name") == signal.name
-                        ):
-                            if signal.previous_val is None:
-                                self.handles[index].previous_val = copy.deepcopy(
-                                    signal.handle.value
-                                )
-
-                                if signal.handle.value.is_resolvable is not True:
-                                    if "z" in signal.handle.value:
-                                        subentry["wave"] += "z"
-                                    else:
-                                        subentry["wave"] += "x"
-                                else:
-                                    if signal.handle.__len__() > 1:
-                                        subentry["data"] += (
-                                            str(hex(signal.handle.value)) + " "
-                                        )
-                                        subentry["wave"] += signal.color_data
-                                    else:
-                                        subentry["wave"] += str(signal.handle.value)
-                            elif signal.handle.value == signal.previous_val:
-                                subentry["wave"] += "."
-                            else:
-                                self.handles[index].previous_val = copy.deepcopy(
-                                    signal.handle.value
-                                )
-
-                                if signal.handle.value.is_resolvable is not True:
-                                    if "z" in signal.handle.value:
-                                        subentry["wave"] += "z"
-                                    else:
-                                        subentry["wave"] += "x"
-                                else:
-                                    if signal.handle.__len__() > 1:
-                                        subentry["wave"] += signal.color_data
-                                        subentry["data"] += (
-                                            str(hex(signal.handle.value)) + " "
-                                        )
-                                    else:
-                                        subentry["wave"] += str(signal.handle.value)
+                self._add_signals(domain, timestamp)
+
+    def _add_signals(self, domain, timestamp):
+        if self.truncated and self.overflow in ("stop", "head"):
+            # Keeping the head, only accounts what is being dropped
+            if self.overflow == "head":
+                self.dropped += 1
+            return
+
+        # Batched snapshot of the domain, only the changes get classified
+        snapshot = [_binstr(signal.handle) for signal in domain.signals]
+        changed = [
+            (signal, binstr)
+            for signal, binstr in zip(domain.signals, snapshot)
+            if binstr != signal.previous_val
+        ]
+        values = classify([binstr for _, binstr in changed]) if changed else []
+
+        # Budget checked before storing the sample, so N samples keep N
+        cost = _SAMPLE_BYTES + sum(
+            _CHANGE_BYTES + (len(label) if label else 0) for _, label in values
+        )
+        if self._over_budget(cost):
+            self._overflow()
+            if self.overflow in ("stop", "head"):
+                if self.overflow == "head":
+                    self.dropped += 1
+                return
+
+        index = domain.dropped + len(domain.timestamps)
+        domain.timestamps.append(timestamp)
+        self.cycles += 1
+        self.mem += _SAMPLE_BYTES
+        if changed:
+            self.mem += self._append_changes(changed, values, index)
+        for group in domain.decoders:
+            self.mem += self._decode(group, index)
+
+    def _append_changes(self, changed, values, index):
+        # Returns the estimated bytes added to the sample store
+        mem = 0
+        for (signal, binstr), (char, label) in zip(changed, values):
+            signal.previous_val = binstr
+
+            if signal.is_clock is True:
+                if char in ("0", "1", None):
+                    char = "P" if signal.is_posedge_clock else "N"
+                if signal.changes and signal.changes[-1][1] == char:
+                    continue
+            elif char is None:
+                char = signal.color_data
+
+            signal.changes.append((index, char, label))
+            mem += _CHANGE_BYTES + (len(label) if label else 0)
+        return mem
+
+    def _decode(self, group, index):
+        values = {}
+        for signal in group.raw:
+            values[signal.name] = resolved(_binstr(signal.handle))
+
+        labels = group.decoder.decode(values)
+        mem = 0
+        for signal in group.lanes:
+            label = labels.get(signal.name)
+            if label is not None:
+                # Every transaction is a new change, even with the same label
+                signal.previous_val = label
+                signal.changes.append((index, signal.color_data, str(label)))
+                mem += _CHANGE_BYTES + len(str(label))
+            elif signal.previous_val != "z":
+                signal.previous_val = "z"
+                signal.changes.append((index, "z", None))
+                mem += _CHANGE_BYTES
+        return mem
+
+    def _over_budget(self, cost):
+        # Whether one more sample of cost bytes goes over the budget
+        if self.max_cycles is not None and self.cycles + 1 > self.max_cycles:
+            return True
+        if self.max_mem is not None and self.mem + cost > self.max_mem:
+            return True
+        if waveform.global_max_cycles is not None:
+            if sum(w.cycles for w in waveform._live) + 1 > waveform.global_max_cycles:
+                return True
+        if waveform.global_max_mem is not None:
+            if sum(w.mem for w in waveform._live) + cost > waveform.global_max_mem:
+                return True
+        return False
+
+    def _overflow(self):
+        if not self.truncated:
+            self.truncated = True
+            self.log.warning(
+                f"Waveform ({self.name}) reached its budget after {self.cycles} "
+                f"samples / ~{self.mem} bytes, overflow mode: {self.overflow}"
+            )
+
+        # On "stop" the monitors leave their loop on the next edge
+        if self.overflow in ("tail", "spill"):
+            self._trim()
+
+    def _trim(self):
+        # Drops (or spills) the oldest quarter of the samples, the whole
+        # capture is cut at the same sim time to keep domains aligned
+        longest = max(self.domains.values(), key=lambda d: len(d.timestamps))
+        if len(longest.timestamps) < 2:
+            return
+        cut = longest.timestamps[max(1, len(longest.timestamps) // 4)]
+        spill = []
+
+        for path, domain in self.domains.items():
+            count = bisect.bisect_left(domain.timestamps, cut)
+            if count == 0:
+                continue
+
+            first = domain.dropped + count
+            lanes = {}
+            for signal in domain.lanes():
+                # Keep the last change before the cut as the starting value
+                pos = bisect.bisect_left(signal.changes, (first,))
+                if pos > 0:
+                    lanes[signal.path] = signal.changes[:pos]
+                    index, wave, label = signal.changes[pos - 1]
+                    del signal.changes[:pos]
+                    if not signal.changes or signal.changes[0][0] != first:
+                        signal.changes.insert(0, (first, wave, label))
+
+            if self.overflow == "spill":
+                spill.append(
+                    {
+                        "domain": path,
+                        "first": domain.dropped,
+                        "timestamps": domain.timestamps[:count],
+                        "lanes": lanes,
+                    }
+                )
+
+            del domain.timestamps[:count]
+            domain.dropped = first
+            self.dropped += count
+
+        if spill:
+            with open(self.name + ".spill.jsonl", "a") as file:
+                for chunk in spill:
+                    file.write(json.dumps(chunk) + "\n")
+
+        self.cycles, self.mem = self._usage()
+
+    def _usage(self):
+        cycles = sum(len(domain.timestamps) for domain in self.domains.values())
+        mem = cycles * _SAMPLE_BYTES
+        for signal in self.handles:
+            mem += len(signal.changes) * _CHANGE_BYTES
+            mem += sum(len(label) for _, _, label in signal.changes if label)
+        return cycles, mem
 
     def set_head(self, text, tick, every):
         self.head = {"text": text, "tick": tick, "every": every}
@@ -303,56 +700,495 @@ class waveform:
     def set_foot(self, text, tick, every):
         self.foot = {"text": text, "tick": tick, "every": every}
 
-    def _incl_width(self):
-        # Format each multi-bit name entry to include width
-        for signal in self.handles:
-            for entry in self.waves["signal"]:
-                if isinstance(entry, dict) and entry["name"] == signal.name:
-                    if signal.handle.__len__() > 1:
-                        entry["name"] += "[" + str(signal.handle.__len__() - 1) + ":0]"
-                elif isinstance(entry, list):
-                    for subentry in entry:
-                        if (
-                            isinstance(subentry, dict)
-                            and subentry.get("name") == signal.name
-                        ):
-                            if signal.handle.__len__() > 1:
-                                subentry["name"] += (
-                                    "[" + str(signal.handle.__len__() - 1) + ":0]"
-                                )
+    def _lane_name(self, signal):
+        # Multi-bit lanes include their width
+        if signal.width > 1:
+            return signal.entry["name"] + "[" + str(signal.width - 1) + ":0]"
+        return signal.entry["name"]
+
+    def _update_grid(self):
+        # Exports work on the samples taken so far, sampling may go on
+        self.grid, self._origin, self._base, self._hscale = self._time_grid()
+
+    def _time_grid(self):
+        # Lays every domain on the main clock cycles, returns for each of
+        # them (period, phase, padding samples, slot of each sample) plus the
+        # sim time of cycle 0, the main clock period and the wavedrom hscale
+        periods = {path: domain.period for path, domain in self.domains.items()}
+        base = periods[self.clk._path]
+
+        if base is None:
+            # Not enough samples to derive the main clock, keep the sample order
+            grid = {
+                path: (None, 0, 0, domain.slots(None))
+                for path, domain in self.domains.items()
+            }
+            return grid, None, None, self.hscale
+
+        started = [path for path, domain in self.domains.items() if domain.timestamps]
+        origin = min(self.domains[path].timestamps[0] for path in started)
+        if self._trimmed():
+            # One cycle ahead of the samples kept, drawn as a gap
+            origin -= base
+        steps = {}
+        for path in started:
+            domain = self.domains[path]
+            # Single sample domains take their clock_period, or the main one
+            period = periods[path] or self._fallback_period(domain, base)
+            offset = domain.timestamps[0] - origin
+            # Pads whole cycles before the first sample and shifts the lane left
+            pad = -(-offset // period)
+            steps[path] = (period, pad * period - offset, pad)
+
+        # wavedrom truncates period * hscale and rounds the phase to half
+        # bricks, hscale is scaled until all of them are whole numbers (up to
+        # its limit of 100, where lanes are rounded)
+        unit = math.gcd(
+            *(self.hscale * period for period, _, _ in steps.values()),
+            *(2 * self.hscale * shift for _, shift, _ in steps.values()),
+        )
+        scale = base // math.gcd(base, unit)
+        if self.hscale * scale > _MAX_HSCALE:
+            scale = max(_MAX_HSCALE // self.hscale, 1)
+        hscale = self.hscale * scale
+
+        grid = {}
+        for path, domain in self.domains.items():
+            if path not in steps:
+                grid[path] = (None, 0, 0, [])
+                continue
+            period, shift, pad = steps[path]
+            bricks = max(round(period * hscale / base), 1)
+            # Phase in 1/hscale of a cycle, as wavedrom expects it
+            phase = round(2 * shift * hscale / base) / 2
+            grid[path] = (bricks / hscale, phase, pad, domain.slots(period))
+        return grid, origin, base, hscale
+
+    def _trimmed(self):
+        # Oldest samples dropped (or spilled), the diagram starts with a gap
+        return self.overflow in ("tail", "spill") and self.dropped > 0
+
+    def _fallback_period(self, domain, base):
+        for signal in domain.signals:
+            if signal.is_clock and signal.handle is domain.clk:
+                return max(int(round(signal.clock_period * base)), 1)
+        return base
+
+    def _wavedrom_period(self, period):
+        # Smallest float not truncated below the lane bricks by wavedrom
+        bricks = round(period * self._hscale)
+        value = bricks / self._hscale
+        while int(value * self._hscale - 1) < bricks - 1:
+            value = math.nextafter(value, math.inf)
+        return int(value) if value.is_integer() else value
+
+    def _lane_changes(self, signal, pad, slots):
+        # Changes of a lane as (position on its grid, wave char, data label)
+        if pad > 0:
+            yield 0, "x", None
+        first = signal.domain.dropped
+        for index, char, label in signal.changes:
+            yield pad + slots[index - first], char, label
+
+    def _lane_length(self, pad, slots):
+        return pad + (slots[-1] + 1 if slots else 0)
+
+    def _gaps(self, pad, slots, start=0):
+        # Cycles where the domain was not sampled (e.g. trigger off)
+        for index in range(start, len(slots) - 1):
+            if slots[index + 1] - slots[index] > 1:
+                yield pad + slots[index] + 1
+
+    def _lane_marks(self, signal, pad, slots, lo, hi):
+        # Changes and gaps of a lane within [lo, hi) of its grid, as
+        # (position, wave char, data label), the value at lo is restated
+        first = signal.domain.dropped
+        sample = bisect.bisect_left(slots, lo - pad)
+        pos = bisect.bisect_left(signal.changes, (first + sample,))
+
+        missing = lo >= pad and 0 < sample < len(slots) and slots[sample] > lo - pad
+        if lo < pad:
+            yield lo, "|" if self._trimmed() else "x", None
+        elif missing:
+            # Window starting in a gap, the value is restated once sampling
+            # resumes
+            yield lo, "|", None
+            resume = pad + slots[sample]
+            if pos > 0 and resume < hi:
+                if pos == len(signal.changes) or signal.changes[pos][0] > first + sample:
+                    _, char, label = signal.changes[pos - 1]
+                    yield resume, char, label
+        elif pos > 0 and (
+            pos == len(signal.changes)
+            or pad + slots[signal.changes[pos][0] - first] > lo
+        ):
+            _, char, label = signal.changes[pos - 1]
+            yield lo, char, label
+
+        changes = (
+            (pad + slots[index - first], char, label)
+            for index, char, label in itertools.islice(signal.changes, pos, None)
+        )
+        gaps = (
+            (gap, "|", None)
+            for gap in self._gaps(pad, slots, max(sample - 1, 0))
+            if gap > lo
+        )
+        for mark in heapq.merge(changes, gaps):
+            if mark[0] >= hi:
+                break
+            yield mark
+
+    def _wave_chunks(self, marks, lo, hi, marker):
+        # Wave string of a lane in pieces of about _CHUNK chars
+        pos, buf, size = lo, [], 0
+        for slot, char, _ in marks:
+            while slot - pos > _CHUNK:
+                yield "".join(buf) + "." * _CHUNK
+                buf, size, pos = [], 0, pos + _CHUNK
+            buf.append("." * (slot - pos) + char)
+            size += slot - pos + 1
+            pos = slot + 1
+            if size >= _CHUNK:
+                yield "".join(buf)
+                buf, size = [], 0
+        yield "".join(buf)
+        while pos < hi:
+            yield "." * min(hi - pos, _CHUNK)
+            pos += _CHUNK
+        if marker:
+            # Marks the cycles that were not kept because of the budget
+            yield "|"
+
+    def _lane_attrs(self, signal, window):
+        # Grid range [lo, hi) of the lane and its wavedrom period/phase
+        period, phase, pad, slots = self.grid[signal.domain.clk._path]
+        length = self._lane_length(pad, slots)
+        lo, hi = 0, length
+        if window is not None:
+            step, shift = period or 1, phase / self._hscale
+            # Window start on the half brick grid, so phases stay exact
+            half = 2 * self._hscale
+            start = math.floor(window[0] * half + _EPS) / half
+            lo = max(int(math.floor((start + shift) / step + _EPS)), 0)
+            hi = min(int(math.ceil((window[1] + shift) / step - _EPS)), length)
+            phase = round((start - (lo * step - shift)) * half) / 2
+
+        attrs = {}
+        if period is not None:
+            if period != 1 or signal.is_clock:
+                attrs["period"] = self._wavedrom_period(period)
+            if phase:
+                attrs["phase"] = int(phase) if float(phase).is_integer() else phase
+        elif signal.is_clock:
+            attrs["period"] = signal.clock_period
+
+        marker = hi == length and self.truncated and self.overflow in ("stop", "head")
+        return lo, hi, attrs, marker
 
     def _close(self):
         if self.close is False:
             self.close = True
 
-            self.mon.kill()
-            self._incl_width()
-            self.waves["config"] = {"hscale": self.hscale}
-            self.waves["head"] = self.head
-            self.waves["foot"] = self.foot
+            self.pause()
+
+    def _budget_head(self):
+        if not self.truncated:
+            return self.head
+
+        if self.overflow == "stop":
+            note = "sampling stopped by budget"
+        elif self.overflow == "head":
+            note = f"{self.dropped} samples dropped at the end"
+        elif self.overflow == "tail":
+            note = f"first {self.dropped} samples dropped"
+        else:
+            note = f"first {self.dropped} samples spilled to {self.name}.spill.jsonl"
+
+        head = dict(self.head)
+        head["text"] = f"{self.head['text']} ({note})"
+        return head
+
+    def pause(self):
+        # Samplers are restarted by resume(), the recorded sim time keeps the
+        # paused cycles on the time axis as gaps
+        for domain in self.domains.values():
+            if domain.mon is not None:
+                domain.mon.kill()
+                domain.mon = None
+        if self.debug:
+            print("[Waves - Debug] Pausing sampling signals")
+
+    def resume(self):
+        if self._start and not self.close:
+            for domain in self.domains.values():
+                if domain.mon is None:
+                    domain.mon = cocotb.start_soon(self._monitor(domain))
+            if self.debug:
+                print("[Waves - Debug] Resuming sampling signals")
+
+    def snapshot(self, delta=False, file=None, compact=True):
+        # Exports the current diagram, or with delta=True only the cycles
+        # since the previous snapshot, while sampling goes on. Returns the
+        # JSON when no file is given
+        self._update_grid()
+        end = self._cycles()
+        start = self._snap_start(end)
+        if self._base is not None:
+            self._snap = (self._origin + end * self._base, False)
+        else:
+            # No period yet, the next window starts after the last sample
+            last = [d.timestamps[-1] for d in self.domains.values() if d.timestamps]
+            if last:
+                self._snap = (max(last), True)
+        window = (_num(max(start, 0)), _num(end)) if delta else None
+
+        if file is None:
+            text = io.StringIO()
+            self._serialize(text.write, compact, window)
+            return text.getvalue()
+        self._write(file, compact, window)
+
+    def _snap_start(self, end):
+        # Cycle where the previous snapshot ended, converted from its sim time
+        # on the current grid
+        if self._snap is None:
+            return 0
+        time, after = self._snap
+        if self._base is None:
+            stamps = self.domains[self.clk._path].timestamps
+            return (bisect.bisect_right if after else bisect.bisect_left)(stamps, time)
+        if after:
+            # First sample taken after the mark, in any domain
+            following = []
+            for domain in self.domains.values():
+                pos = bisect.bisect_right(domain.timestamps, time)
+                if pos < len(domain.timestamps):
+                    following.append(domain.timestamps[pos])
+            if not following:
+                return end
+            time = min(following)
+        return (time - self._origin) / self._base
+
+    def _cycles(self):
+        # Length of the diagram in main clock cycles
+        ends = [0]
+        for period, phase, pad, slots in self.grid.values():
+            length = self._lane_length(pad, slots)
+            ends.append((period or 1) * length - phase / self._hscale)
+        return max(ends)
 
     def __str__(self):
-        return str(json.dumps(self.waves))
+        self._update_grid()
+        text = io.StringIO()
+        self._serialize(text.write, compact=True)
+        return text.getvalue()
 
     def stop(self):
         self._close()
         if self.debug:
             print("[Waves - Debug] Stopping sims")
 
-    def save_svg(self):
+    def _serialize(self, write, compact=False, window=None):
+        # Writes the wavedrom JSON straight from the sample store, lane by
+        # lane, without building the diagram in memory, on the grid computed
+        # by the caller
+        seps = (",", ":") if compact else (", ", ": ")
+        sep = seps[1]
+        head = self._budget_head()
+        if window is not None:
+            start, end = _num(window[0]), _num(window[1])
+            head = dict(head, text=f"{head['text']} [{start}:{end}]")
+
+        write("{" + ("" if compact else "\n    ") + '"signal"' + sep + "[")
+        by_entry = {id(signal.entry): signal for signal in self.handles}
+        self._serialize_items(
+            write, self.waves["signal"], by_entry, window, compact, seps, 2
+        )
+        write("" if compact else "\n    ")
+        write("]")
+        for key, value in (
+            ("config", {"hscale": self._hscale}),
+            ("head", head),
+            ("foot", self.foot),
+        ):
+            write(("," if compact else ",\n    ") + json.dumps(key) + sep)
+            write(json.dumps(value, separators=seps))
+        write("}" if compact else "\n}\n")
+
+    def _serialize_items(self, write, items, by_entry, window, compact, seps, depth):
+        indent = "" if compact else "\n" + "    " * depth
+        for pos, item in enumerate(items):
+            write(("," if pos else "") + indent)
+            if isinstance(item, list):
+                write("[" + ("" if compact else "\n" + "    " * (depth + 1)))
+                write(json.dumps(item[0]) + ("," if len(item) > 1 else ""))
+                self._serialize_items(
+                    write, item[1:], by_entry, window, compact, seps, depth + 1
+                )
+                write(indent + "]")
+            else:
+                self._serialize_lane(write, by_entry[id(item)], window, seps)
+
+    def _serialize_lane(self, write, signal, window, seps):
+        comma, sep = seps
+        lo, hi, attrs, marker = self._lane_attrs(signal, window)
+        _, _, pad, slots = self.grid[signal.domain.clk._path]
+
+        write('{"name"' + sep + json.dumps(self._lane_name(signal)))
+        write(comma + '"wave"' + sep)
+        write('"')
+        marks = self._lane_marks(signal, pad, slots, lo, hi)
+        labels = []
+        if signal.color_data is not None:
+            # Labels picked up while the wave is written, a single pass
+            marks = self._collect_labels(marks, labels)
+        for chunk in self._wave_chunks(marks, lo, hi, marker):
+            write(chunk)
+        write('"')
+
+        if signal.color_data is not None:
+            if signal.handle is None:
+                # Decoded labels hold spaces, written as a list
+                write(comma + '"data"' + sep + "[")
+                for pos, label in enumerate(labels):
+                    write((comma if pos else "") + json.dumps(label))
+                write("]")
+            else:
+                write(comma + '"data"' + sep + '"')
+                for pos, label in enumerate(labels):
+                    write((" " if pos else "") + json.dumps(label)[1:-1])
+                write('"')
+
+        for key, value in attrs.items():
+            write(comma + json.dumps(key) + sep + json.dumps(value))
+        write("}")
+
+    def _collect_labels(self, marks, labels):
+        for mark in marks:
+            if mark[2] is not None:
+                labels.append(mark[2])
+            yield mark
+
+    def _name(self, window):
+        if window is None:
+            return self.name
+        return f"{self.name}_{_num(window[0])}_{_num(window[1])}"
+
+    def save_svg(self, window=None):
         self._close()
+        self._update_grid()
+        text = io.StringIO()
+        self._serialize(text.write, compact=True, window=window)
+        text = text.getvalue()
         if self.debug:
             print("[Waves - Debug] Printing JSON Wavedrom")
-            print(json.dumps(self.waves))
-        svg = wavedrom.render(json.dumps(self.waves))
-        svg.saveas(self.name + ".svg")
+            print(text)
+        svg = wavedrom.render(text)
+        svg.saveas(self._name(window) + ".svg")
 
-    def save_txt(self):
+    def save_txt(self, file=None, compact=False, window=None):
+        # file: path or any object with write() (e.g. socket.makefile("w")),
+        # sockets are written through sendall()
         self._close()
+        self._update_grid()
+        self._write(
+            file if file is not None else self._name(window) + ".txt", compact, window
+        )
+
+    def _write(self, file, compact, window):
         try:
-            with open(self.name + ".txt", "w") as file:
-                json.dump(self.waves, file, indent=4)  # indent for better readability
+            if isinstance(file, str):
+                with open(file, "w") as out:
+                    writer = _chunk_writer(out.write)
+                    self._serialize(writer, compact, window)
+                    writer.flush()
+            else:
+                if hasattr(file, "write"):
+                    writer = _chunk_writer(file.write)
+                else:
+                    writer = _chunk_writer(lambda data: file.sendall(data.encode()))
+                self._serialize(writer, compact, window)
+                writer.flush()
             if self.debug:
-                print(f"Wavedrom diagram written into {self.name}.txt")
+                print(f"Wavedrom diagram written into {file}")
         except Exception as e:
             print(f"An error occurred: {e} while trying to write wavedrom diagram")
+
+    def save_html(self):
+        self._close()
+        try:
+            with open(self.name + ".html", "w") as file:
+                file.write(render_html(self._budget_head()["text"], self._html_data()))
+            if self.debug:
+                print(f"Waveform viewer written into {self.name}.html")
+        except Exception as e:
+            print(f"An error occurred: {e} while trying to write waveform viewer")
+
+    def _html_data(self):
+        # Compact sample data for the viewer, positions stay in the cycles of
+        # each domain and are laid on the main clock by the browser
+        self._update_grid()
+        domains, index = [], {}
+        for path, (period, phase, pad, slots) in self.grid.items():
+            index[path] = len(domains)
+            domains.append(
+                {
+                    "period": period if period is not None else 1,
+                    "offset": -phase / self._hscale,
+                    "length": self._lane_length(pad, slots),
+                    "gaps": list(self._gaps(pad, slots)),
+                }
+            )
+
+        by_entry = {id(signal.entry): signal for signal in self.handles}
+        lanes = []
+        for prefix, entry in self._flat_lanes(self.waves["signal"], ""):
+            signal = by_entry[id(entry)]
+            path = signal.domain.clk._path
+            _, _, pad, slots = self.grid[path]
+            changes = list(self._lane_changes(signal, pad, slots))
+            lanes.append(
+                {
+                    "name": prefix + self._lane_name(signal),
+                    "domain": index[path],
+                    "s": [slot for slot, _, _ in changes],
+                    "w": "".join(char for _, char, _ in changes),
+                    "d": [label for _, _, label in changes],
+                }
+            )
+
+        cycles = max(
+            [d["offset"] + d["length"] * d["period"] for d in domains] + [0]
+        )
+        return {"domains": domains, "lanes": lanes, "cycles": cycles}
+
+    def _flat_lanes(self, items, prefix):
+        # Lanes in diagram order with the path of the groups they belong to
+        for item in items:
+            if isinstance(item, list):
+                yield from self._flat_lanes(item[1:], prefix + str(item[0]) + "/")
+            else:
+                yield prefix, item
+
+    def query(self):
+        # Indexes of the samples taken so far, sampling goes on
+        self._update_grid()
+        by_entry = {id(signal.entry): signal for signal in self.handles}
+        lanes = []
+        for prefix, entry in self._flat_lanes(self.waves["signal"], ""):
+            signal = by_entry[id(entry)]
+            period, phase, pad, slots = self.grid[signal.domain.clk._path]
+            period = 1 if period is None else period
+            offset = -phase / self._hscale
+
+            times, values = [], []
+            for slot, char, label in self._lane_changes(signal, pad, slots):
+                times.append(round(offset + slot * period, 6))
+                values.append(_value(char, label))
+
+            end = round(offset + self._lane_length(pad, slots) * period, 6)
+            lanes.append(
+                (prefix + signal.name, signal_index(signal.name, times, values, end))
+            )
+        return trace(lanes)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : gpi.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+from cocotb.handle import ModifiableObject, HierarchyObject
+
+
+class gpi_signal:
+    # Bare GPI handle holding a binary string, no simulator needed
+    def __init__(self, name, binstr) -> None:
+        self.name = name
+        self.binstr = binstr
+
+    def get_name_string(self):
+        return self.name
+
+    def get_type_string(self):
+        return "GPI_NET"
+
+    def get_definition_name(self):
+        return ""
+
+    def get_definition_file(self):
+        return ""
+
+    def get_num_elems(self):
+        return len(self.binstr)
+
+    def get_range(self):
+        return (len(self.binstr) - 1, 0)
+
+    def get_signal_val_binstr(self):
+        return self.binstr
+
+
+def signal(name, width=1, path=None):
+    return ModifiableObject(gpi_signal(name, "0" * width), path or name)
+
+
+def scope(name, children, path=None):
+    handle = HierarchyObject(gpi_signal(name, "0"), path or name)
+    for child in children:
+        handle._sub_handles[child._name] = child
+    handle._discovered = True
+    return handle
+
+
+def drive(handle, value):
+    # Binary string or integer, as returned by the simulator on the next read
+    if isinstance(value, str):
+        handle._handle.binstr = value
+    else:
+        handle._handle.binstr = format(value, "0%db" % len(handle._handle.binstr))
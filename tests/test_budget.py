@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : test_budget.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+import gc
+import json
+
+from gpi import signal, drive
+from cocotbext.waves import waveform
+
+
+def sample(waves, data, count, start=0):
+    domain = waves.domains[waves.clk._path]
+    for step in range(start, start + count):
+        drive(data, step)
+        waves._add_signals(domain, step * 10)
+
+
+def lanes(waves):
+    diagram = json.loads(str(waves))
+    return diagram["head"]["text"], [lane["wave"] for lane in diagram["signal"]]
+
+
+def test_budget_stop_head():
+    """
+    Budget of N samples keeps the first N, stop and head modes
+
+    Test ID: 11
+    """
+    for overflow, note in (
+        ("stop", "sampling stopped by budget"),
+        ("head", "4 samples dropped at the end"),
+    ):
+        data = signal("data", 4)
+        waves = waveform(
+            signal("clk"), overflow, start=False, max_cycles=8, overflow=overflow
+        )
+        waves.add_signal(data)
+        sample(waves, data, 12)
+
+        assert waves.cycles == 8 and waves.truncated
+        assert waves.query().changes("data")[-1] == (7, 7)
+        head, (clk_wave, data_wave) = lanes(waves)
+        assert head == f"{overflow} ({note})"
+        assert clk_wave == "P.......|"
+        assert data_wave == "3333333" + "3|"
+
+
+def test_budget_spill(tmp_path, monkeypatch):
+    """
+    Tail of the capture kept, the oldest samples spilled and marked by a gap
+
+    Test ID: 12
+    """
+    monkeypatch.chdir(tmp_path)
+    data = signal("data", 4)
+    waves = waveform(
+        signal("clk"), "spill", start=False, max_cycles=8, overflow="spill"
+    )
+    waves.add_signal(data)
+    sample(waves, data, 12)
+
+    assert waves.cycles <= 8 and waves.dropped == 12 - waves.cycles
+    head, (clk_wave, data_wave) = lanes(waves)
+    assert head == f"spill (first {waves.dropped} samples spilled to spill.spill.jsonl)"
+    # Gap cycle ahead of the samples kept
+    assert clk_wave == "|P" + "." * (waves.cycles - 1)
+    assert data_wave == "|" + "3" * waves.cycles
+    changes = waves.query().changes("data")
+    assert changes[0] == (0, "x") and changes[1] == (1, 12 - waves.cycles)
+
+    with open("spill.spill.jsonl") as file:
+        chunks = [json.loads(line) for line in file]
+    timestamps = [t for chunk in chunks for t in chunk["timestamps"]]
+    assert timestamps == [step * 10 for step in range(waves.dropped)]
+
+
+def test_budget_mem():
+    """
+    Estimated memory budget
+
+    Test ID: 13
+    """
+    data = signal("data", 32)
+    waves = waveform(signal("clk"), "mem", start=False, max_mem=2000)
+    waves.add_signal(data)
+    sample(waves, data, 100)
+
+    assert waves.truncated and 0 < waves.cycles < 100
+    assert waves.mem <= 2000
+
+
+def test_budget_global():
+    """
+    Budget shared by every live waveform
+
+    Test ID: 14
+    """
+    gc.collect()
+    waveform.set_global_budget(max_cycles=10)
+    try:
+        first, second = signal("first", 4), signal("second", 4)
+        waves_a = waveform(signal("clk_a"), "a", start=False)
+        waves_b = waveform(signal("clk_b"), "b", start=False)
+        waves_a.add_signal(first)
+        waves_b.add_signal(second)
+        sample(waves_a, first, 6)
+        sample(waves_b, second, 6)
+
+        assert (waves_a.cycles, waves_b.cycles) == (6, 4)
+        assert waves_b.truncated and not waves_a.truncated
+    finally:
+        waveform.set_global_budget()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : test_classify.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+import json
+
+from gpi import signal, drive
+from cocotbext.waves import waveform
+from cocotbext.waves.classify import classify, resolved
+
+
+def test_classify():
+    """
+    X/Z classification of sampled binary strings
+
+    Test ID: 5
+    """
+    values = classify(
+        [
+            "xxxxxxxx00010010",  # Only the upper byte unknown
+            "z" * 16,
+            "x" * 16,
+            "xzxz",  # Every bit unknown, mixed x/z
+            "xxzz0000",  # Partially unknown, mixed x/z in a nibble
+            "zzzz0000xxxx0011",
+            "zz0101",  # Width not multiple of 4
+            "x0101",
+            "0x",
+            "1" * 512,
+            "1",
+            "z",
+            "0H1L",  # VHDL weak values
+            "H",
+            "u-LW",
+        ]
+    )
+    assert values == [
+        (None, "0xXX12"),
+        ("z", None),
+        ("x", None),
+        ("x", None),
+        (None, "0xX0"),
+        (None, "0xZ0X3"),
+        (None, "0xZ5"),
+        (None, "0xX5"),
+        (None, "0xX"),
+        (None, hex(2**512 - 1)),
+        ("1", None),
+        ("z", None),
+        (None, "0x6"),
+        ("1", None),
+        (None, "0xX"),
+    ]
+    # All resolved batch, classified through the single pass
+    assert classify(["0101", "1", "00010010"]) == [
+        (None, "0x5"),
+        ("1", None),
+        (None, "0x12"),
+    ]
+    assert resolved("0101") == 5 and resolved("01x1") is None
+    assert resolved("H0L-") == 8 and resolved("HZ") is None
+
+
+def test_classify_lanes():
+    """
+    Partially unknown buses and clocks going from unknown to resolved
+
+    Test ID: 6
+    """
+    clk = signal("clk")
+    data = signal("data", 16)
+    waves = waveform(clk, "classify", start=False)
+    waves.add_signal(data)
+    domain = waves.domains[clk._path]
+
+    for step, (clk_val, data_val) in enumerate(
+        [
+            ("x", "z" * 16),
+            ("1", "xxxxxxxx00010010"),
+            ("1", "xxxxxxxx00010010"),
+            ("0", "0001001000110100"),
+        ]
+    ):
+        drive(clk, clk_val)
+        drive(data, data_val)
+        waves._add_signals(domain, step * 10)
+
+    clk_lane, data_lane = json.loads(str(waves))["signal"]
+    assert clk_lane["wave"] == "xP.."
+    assert data_lane["wave"] == "z3.3"
+    assert data_lane["data"] == "0xXX12 0x1234"
+    assert waves.query().changes("data") == [(0, "z"), (1, "0xXX12"), (3, 0x1234)]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : test_decoders.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+import json
+import pytest
+
+from gpi import signal, drive
+from cocotbext.waves import waveform, ahb_decoder
+
+AHB_SIGNALS = {
+    "hsel": 1,
+    "haddr": 32,
+    "htrans": 2,
+    "hwrite": 1,
+    "hsize": 3,
+    "hwdata": 32,
+    "hrdata": 32,
+    "hready": 1,
+    "hresp": 2,
+}
+
+
+def ahb_waveform():
+    clk = signal("clk")
+    bus = {name: signal(name, width) for name, width in AHB_SIGNALS.items()}
+    waves = waveform(clk, "decoder", start=False)
+    waves.add_signal(list(bus.values()), group="AHB")
+    return waves, bus
+
+
+def test_decoder_drop_raw():
+    """
+    AHB group collapsed into its transaction lanes, raw lanes dropped
+
+    Test ID: 17
+    """
+    waves, bus = ahb_waveform()
+    domain = waves.domains[waves.clk._path]
+    waves.add_decoder("AHB", ahb_decoder())
+
+    # Nothing of the raw lanes is stored, they are only read by the decoder
+    raw = {id(handle) for handle in bus.values()}
+    assert not [s for s in waves.handles if id(s.handle) in raw]
+    assert [s.name for s in domain.signals] == ["clk"]
+    assert [s.path for s in domain.lanes()] == ["clk", "AHB/txn", "AHB/data"]
+
+    drive(bus["hready"], 1)
+    drive(bus["hsel"], 1)
+    for step, (htrans, haddr, hwrite, hwdata) in enumerate(
+        [(2, 0x1000, 1, 0), (2, 0x2000, 0, 0xCAFE), (0, 0, 0, 0), (0, 0, 0, 0)]
+    ):
+        drive(bus["htrans"], htrans)
+        drive(bus["haddr"], haddr)
+        drive(bus["hwrite"], hwrite)
+        drive(bus["hsize"], 2)
+        drive(bus["hwdata"], hwdata)
+        drive(bus["hrdata"], 0x55)
+        waves._add_signals(domain, step * 10)
+
+    clk_lane, (group, txn, data) = json.loads(str(waves))["signal"]
+    assert group == "AHB"
+    assert txn["wave"] == data["wave"] == "z33z"
+    assert txn["data"] == ["WR 0x1000 4B OKAY", "RD 0x2000 4B OKAY"]
+    assert data["data"] == ["0xcafe", "0x55"]
+    assert waves.query().where("AHB/txn", "RD 0x2000 4B OKAY") == [(2, 3)]
+
+
+def test_decoder_invalid_groups():
+    """
+    Groups that can not be decoded
+
+    Test ID: 18
+    """
+    waves, _ = ahb_waveform()
+    waves.add_signal([signal("fast"), signal("slow")], is_clock=True, group="CLKS")
+
+    with pytest.raises(ValueError, match="not found"):
+        waves.add_decoder("APB", ahb_decoder())
+    with pytest.raises(ValueError, match="more than one clock domain"):
+        waves.add_decoder("CLKS", ahb_decoder())
+
+    waves.add_decoder("AHB", ahb_decoder())
+    with pytest.raises(ValueError, match="already decoded"):
+        waves.add_decoder("AHB", ahb_decoder())
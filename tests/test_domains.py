@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : test_domains.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+import json
+
+from gpi import signal, drive
+from cocotbext.waves import waveform
+from wavedrom.waveform import WaveDrom
+
+
+def rendered_bricks(diagram):
+    # Length of every lane as drawn by wavedrom, in bricks
+    render = WaveDrom()
+    render.lane.hscale = diagram["config"]["hscale"]
+    lanes = render.parse_wave_lanes(diagram["signal"])
+    return {
+        lane["name"]: len(bricks)
+        for lane, (_, bricks, _) in zip(diagram["signal"], lanes)
+    }
+
+
+def test_domains_common_tick():
+    """
+    Clock domains not integer related drawn with their real length
+
+    Test ID: 9
+    """
+    clk, fast, data = signal("clk"), signal("fast"), signal("data")
+    waves = waveform(clk, "domains", start=False)
+    waves.add_signal(fast, is_clock=True)
+    waves.add_signal(data, clk=fast)
+    main, domain = waves.domains[clk._path], waves.domains[fast._path]
+
+    # 10 cycles of 10 steps on the main clock, 14 of 7 steps from 1003
+    for step in range(10):
+        waves._add_signals(main, 1000 + 10 * step)
+    for step in range(14):
+        drive(data, step % 2)
+        waves._add_signals(domain, 1003 + 7 * step)
+
+    diagram = json.loads(str(waves))
+    hscale = diagram["config"]["hscale"]
+    assert hscale == 10
+    clk_lane, fast_lane, data_lane = diagram["signal"]
+    assert fast_lane["period"] == data_lane["period"] == 0.7
+    assert fast_lane["phase"] == 4  # 0.4 cycles, first sample at 0.3
+    # 10 cycles and (1 + 14) * 0.7 - 0.4 with the padding, 2 * hscale bricks each
+    assert rendered_bricks(diagram) == {
+        "clk": 10 * 2 * hscale,
+        "fast": 10.1 * 2 * hscale,
+        "data": 10.1 * 2 * hscale,
+    }
+    assert waves.query().changes("data", 0, 2) == [(0.3, 0), (1.0, 1), (1.7, 0)]
+
+
+def test_domains_single_sample():
+    """
+    Domain with a single sample laid on the main clock period
+
+    Test ID: 10
+    """
+    clk, nclk, data = signal("clk"), signal("nclk"), signal("data")
+    waves = waveform(clk, "single", start=False)
+    waves.add_signal(data, clk=nclk)
+
+    for step in range(10):
+        waves._add_signals(waves.domains[clk._path], 1000 + 10 * step)
+    drive(data, 1)
+    waves._add_signals(waves.domains[nclk._path], 1085)
+
+    assert waves.query().changes("data") == [(-0.5, "x"), (8.5, 1)]
+    clk_lane, data_lane = json.loads(str(waves))["signal"]
+    assert clk_lane["wave"] == "P........."
+    assert data_lane["wave"] == "x........1"
+    assert data_lane["phase"] == 1
+
+
+def test_domains_export_grid():
+    """
+    Grid computed once per export, sample slots derived on access
+
+    Test ID: 15
+    """
+    clk, data = signal("clk"), signal("data", 8)
+    waves = waveform(clk, "grid", start=False)
+    waves.add_signal(data)
+    domain = waves.domains[clk._path]
+    # Two cycles not sampled after the third sample
+    for step, time in enumerate((100, 110, 120, 150, 160, 170)):
+        drive(data, step // 2)
+        waves._add_signals(domain, time)
+
+    grids = []
+    update = waves._update_grid
+    waves._update_grid = lambda: grids.append(update())
+    diagram = json.loads(waves.snapshot())
+    assert len(grids) == 1
+
+    slots = waves.grid[clk._path][3]
+    assert not isinstance(slots, list)
+    assert (len(slots), slots[0], slots[2], slots[3], slots[-1]) == (6, 0, 2, 5, 7)
+    assert diagram["signal"][1]["wave"] == "3.3|..3."
+    assert diagram["signal"][1]["data"] == "0x0 0x1 0x2"
+
+
+def test_domains_snapshot_delta():
+    """
+    Delta snapshot taken before the clock period is known
+
+    Test ID: 16
+    """
+    clk, data = signal("clk"), signal("data", 8)
+    waves = waveform(clk, "delta", start=False)
+    waves.add_signal(data)
+    domain = waves.domains[clk._path]
+
+    waves._add_signals(domain, 100000)
+    first = json.loads(waves.snapshot(delta=True))
+    assert first["head"]["text"] == "delta [0:1]"
+
+    for step in range(1, 6):
+        drive(data, step)
+        waves._add_signals(domain, 100000 + 10 * step)
+    second = json.loads(waves.snapshot(delta=True))
+    assert second["head"]["text"] == "delta [1:6]"
+    assert second["signal"][1]["wave"] == "33333"
+    assert second["signal"][1]["data"] == "0x1 0x2 0x3 0x4 0x5"
+    third = json.loads(waves.snapshot(delta=True))
+    assert third["head"]["text"] == "delta [6:6]"
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : test_gen_ahb_waves_hier.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 18.10.2026
+# Last Modified Date: 19.10.2026
+import cocotb
+import os
+import json
+import random
+
+from const import cfg
+from cocotb.triggers import ClockCycles
+from cocotb.clock import Clock
+from cocotbext.ahb import AHBBus, AHBMaster, AHBSlave
+from cocotb.runner import get_runner
+from cocotbext.waves import waveform, ahb_decoder
+from cocotb.regression import TestFactory
+
+
+def pick_random_value(input_list):
+    if input_list:
+        return random.choice(input_list)
+    else:
+        return None  # Return None if the list is empty
+
+
+def rnd_val(bit: int = 0, zero: bool = True):
+    if zero is True:
+        return random.randint(0, (2**bit) - 1)
+    else:
+        return random.randint(1, (2**bit) - 1)
+
+
+async def setup_dut(dut, cycles):
+    cocotb.start_soon(Clock(dut.hclk, *cfg.CLK_100MHz).start())
+    dut.hresetn.value = 0
+    await ClockCycles(dut.hclk, cycles)
+    dut.hresetn.value = 1
+
+
+@cocotb.test()
+async def run_test(dut):
+    N = 2
+
+    waves = waveform(clk=dut.hclk, name="ahb_test_hier", hscale=3, debug=True)
+    waves.add_hierarchy(AHBBus.from_entity(dut), group="AHB")
+    waves.add_hierarchy(dut, pattern="h*", group=False)
+    waves.add_decoder("AHB", ahb_decoder(), keep_raw=True)
+    waves.add_trigger(dut.hresetn, 1)
+
+    assert len(waves.handles) == len({signal.name for signal in waves.handles})
+
+    await setup_dut(dut, cfg.RST_CYCLES)
+
+    ahb_master = AHBMaster(AHBBus.from_entity(dut), dut.hclk, dut.hresetn, def_val="Z")
+    ahb_slave = AHBSlave(AHBBus.from_entity(dut), dut.hclk, dut.hresetn)
+
+    type(ahb_slave)
+
+    address = [rnd_val(32) for _ in range(N)]
+    value = [rnd_val(32) for _ in range(N)]
+    size = [random.choice([1, 2, 4]) for _ in range(N)]
+
+    resp = await ahb_master.write(address, value, size, verbose=True)
+    first = json.loads(waves.snapshot(delta=True))
+    waves.pause()
+    await ClockCycles(dut.hclk, 5)
+    waves.resume()
+    resp = await ahb_master.read(address, size, verbose=True)
+    delta = json.loads(waves.snapshot(delta=True))
+    assert first["head"]["text"] != delta["head"]["text"]
+    # The delta starts where sampling was paused
+    assert delta["signal"][0]["wave"].startswith("|")
+    assert "|" in json.loads(str(waves))["signal"][0]["wave"]
+    waves.save_svg()
+
+    q = waves.query()
+    ranges = q.when(haddr=address[0], hwrite=1)
+    assert len(ranges) > 0
+    assert q.when({"AHB/raw/haddr": address[0], "AHB/raw/hwrite": 1}) == ranges
+    labels = [value for _, value in q.changes("AHB/txn")]
+    assert any(str(label).startswith("WR") for label in labels)
+    assert any(str(label).startswith("RD") for label in labels)
+    waves.save_svg(window=(ranges[0][0], ranges[0][1] + 4))
+    type(resp)
+    del waves
+
+
+def test_gen_ahb_waves_hier():
+    """
+    Test generating waveforms registering signals by hierarchy
+
+    Test ID: 4
+    """
+    test_name = os.path.splitext(os.path.basename(__file__))[0]
+
+    SIM_BUILD = os.path.join(cfg.TESTS_DIR, f"../run_dir/{test_name}_{cfg.SIMULATOR}")
+
+    runner = get_runner(cfg.SIMULATOR)
+    runner.build(
+        verilog_sources=cfg.VERILOG_SOURCES,
+        hdl_toplevel=cfg.TOPLEVEL,
+        build_args=cfg.EXTRA_ARGS,
+        timescale=cfg.TIMESCALE,
+        waves=True,
+        build_dir=SIM_BUILD,
+    )
+
+    runner.test(
+        hdl_toplevel=cfg.TOPLEVEL,
+        timescale=cfg.TIMESCALE,
+        test_module=test_name,
+        waves=True,
+        test_dir=SIM_BUILD,
+    )
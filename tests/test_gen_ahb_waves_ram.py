@@ -4,10 +4,14 @@
 # License           : MIT license <Check LICENSE>
 # Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
 # Date              : 25.10.2024
-# Last Modified Date: 01.11.2024
+# Last Modified Date: 19.10.2026
 import cocotb
 import os
+import io
+import json
 import random
+import socket
+import threading
 
 from const import cfg
 from cocotb.triggers import ClockCycles
@@ -66,6 +70,10 @@ async def run_test(dut):
         ],
         group="MISO",
     )
+    waves_tail = waveform(
+        clk=dut.hclk, name="ahb_test_sram_tail", max_cycles=8, overflow="tail"
+    )
+    waves_tail.add_signal([dut.haddr, dut.hwdata, dut.hrdata])
 
     await setup_dut(dut, cfg.RST_CYCLES)
 
@@ -91,6 +99,31 @@ async def run_test(dut):
     print(waves)
     waves.save_svg()
     waves.save_txt()
+
+    # Streamed exports into file-like objects and sockets
+    compact, indented, window = io.StringIO(), io.StringIO(), io.StringIO()
+    waves.save_txt(file=compact, compact=True)
+    waves.save_txt(file=indented)
+    assert "\n" not in compact.getvalue() and "\n" in indented.getvalue()
+    diagram = json.loads(compact.getvalue())
+    assert json.loads(indented.getvalue()) == diagram
+
+    rx, tx = socket.socketpair()
+    received = []
+    reader = threading.Thread(target=lambda: received.append(rx.makefile().read()))
+    reader.start()
+    waves.save_txt(file=tx, compact=True)
+    tx.close()
+    reader.join()
+    rx.close()
+    assert json.loads(received[0]) == diagram
+
+    waves.save_txt(file=window, window=(2, 6))
+    windowed = json.loads(window.getvalue())
+    assert windowed["head"]["text"].endswith("[2:6]")
+    assert len(windowed["signal"][0]["wave"]) == 4
+    waves_tail.save_svg()
+    assert waves_tail.cycles <= 8 and waves_tail.dropped > 0
     type(resp)
     del waves
 
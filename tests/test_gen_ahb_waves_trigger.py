@@ -4,9 +4,10 @@
 # License           : MIT license <Check LICENSE>
 # Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
 # Date              : 25.10.2024
-# Last Modified Date: 01.11.2024
+# Last Modified Date: 19.10.2026
 import cocotb
 import os
+import json
 import random
 
 from const import cfg
@@ -16,6 +17,7 @@ from cocotbext.ahb import AHBBus, AHBMaster, AHBSlave
 from cocotb.runner import get_runner
 from cocotbext.waves import waveform
 from cocotb.regression import TestFactory
+from wavedrom.waveform import WaveDrom
 
 
 def pick_random_value(input_list):
@@ -60,9 +62,10 @@ async def run_test(dut):
             dut.hresp,
         ]
     )
-    waves.add_signal(
-        dut.test_nclk, is_clock=True, is_posedge_clock=False, clock_period=0.50
-    )
+    # clk= used before the clock registration, the domain takes its edge
+    waves.add_signal(dut.hresetn, clk=dut.test_nclk)
+    waves.add_signal(dut.test_nclk, is_clock=True, is_posedge_clock=False)
+    assert waves.domains[dut.test_nclk._path].is_posedge is False
     waves.add_trigger(dut.hresetn, 1)
 
     await setup_dut(dut, cfg.RST_CYCLES)
@@ -80,6 +83,35 @@ async def run_test(dut):
     resp = await ahb_master.read(address, size, verbose=True)
     waves.save_txt()
     waves.save_svg()
+    waves.save_html()
+    diagram = json.loads(str(waves))
+    assert diagram["signal"][-1]["period"] == 0.5
+
+    # Both clocks drawn over the same time, a cycle of hclk at most apart
+    render = WaveDrom()
+    render.lane.hscale = diagram["config"]["hscale"]
+    bricks = {
+        lane["name"]: len(wave)
+        for lane, (_, wave, _) in zip(
+            diagram["signal"], render.parse_wave_lanes(diagram["signal"])
+        )
+    }
+    assert bricks["test_nclk"] > 0
+    assert abs(bricks["hclk"] - bricks["test_nclk"]) <= 2 * render.lane.hscale
+
+    # Data contract of the viewer, embedded as JSON in the page
+    with open("ahb_test.html") as file:
+        page = file.read()
+    start = page.index('id="data">') + len('id="data">')
+    data = json.loads(page[start : page.index("</script>", start)])
+    assert [lane["name"] for lane in data["lanes"]] == [
+        lane["name"] for lane in diagram["signal"]
+    ]
+    assert len(data["domains"]) == len(waves.domains)
+    assert data["domains"][1]["period"] == 0.5
+    assert data["cycles"] >= data["domains"][0]["length"] > 0
+    for lane in data["lanes"]:
+        assert len(lane["s"]) == len(lane["w"]) == len(lane["d"]) > 0
     type(resp)
     del waves
 
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# File              : test_hierarchy.py
+# License           : MIT license <Check LICENSE>
+# Author            : Anderson I. da Silva (aignacio) <anderson@aignacio.com>
+# Date              : 19.10.2026
+# Last Modified Date: 19.10.2026
+from gpi import signal, scope
+from cocotbext.waves import waveform
+
+
+def build_dut():
+    # top: clk, a, b, u_core (result, valid, u_alu (op)), u_empty (foo)
+    u_alu = scope("u_alu", [signal("op", 4, "top.u_core.u_alu.op")], "top.u_core.u_alu")
+    u_core = scope(
+        "u_core",
+        [
+            signal("result", 8, "top.u_core.result"),
+            signal("valid", 1, "top.u_core.valid"),
+            u_alu,
+        ],
+        "top.u_core",
+    )
+    u_empty = scope("u_empty", [signal("foo", 1, "top.u_empty.foo")], "top.u_empty")
+    clk = signal("clk", 1, "top.clk")
+    children = [clk, signal("a", 8, "top.a"), signal("b", 1, "top.b"), u_core, u_empty]
+    return scope("top", children, "top"), clk
+
+
+def names(items):
+    # Diagram structure with lane names only
+    return [
+        [item[0]] + names(item[1:]) if isinstance(item, list) else item["name"]
+        for item in items
+    ]
+
+
+def hierarchy(**kwargs):
+    dut, clk = build_dut()
+    waves = waveform(clk, "hier", start=False)
+    waves.add_hierarchy(dut, **kwargs)
+    return names(waves.waves["signal"][1:]), waves
+
+
+def test_hierarchy():
+    """
+    Bulk registration of a nested hierarchy
+
+    Test ID: 7
+    """
+    # Nested scope groups, the main clock is not registered twice
+    tree, waves = hierarchy()
+    core = ["u_core", "result", "valid", ["u_alu", "op"]]
+    assert tree == [["top", "a", "b", core, ["u_empty", "foo"]]]
+    assert len(waves.handles) == 7
+
+    # Glob over names relative to root, empty scopes are pruned
+    tree, _ = hierarchy(pattern="u_core.*")
+    assert tree == [["top", ["u_core", "result", "valid", ["u_alu", "op"]]]]
+    tree, _ = hierarchy(pattern="u_core.u_alu.*")
+    assert tree == [["top", ["u_core", ["u_alu", "op"]]]]
+    tree, _ = hierarchy(pattern="nothing*")
+    assert tree == []
+
+    # Regex searched in the relative names
+    tree, _ = hierarchy(pattern=r"\.(op|valid)$", regex=True)
+    assert tree == [["top", ["u_core", "valid", ["u_alu", "op"]]]]
+
+    # Top level only, renamed group
+    tree, _ = hierarchy(recursive=False, group="TOP")
+    assert tree == [["TOP", "a", "b"]]
+
+    # Ungrouped lanes, deeper scopes after their parents
+    tree, waves = hierarchy(group=False)
+    assert sorted(tree) == ["a", "b", "foo", "op", "result", "valid"]
+    assert tree[:2] == ["a", "b"]
+    assert all(lane.group is None for lane in waves.handles)
+
+
+def test_hierarchy_registered():
+    """
+    Signals already registered are skipped by add_hierarchy
+
+    Test ID: 8
+    """
+    dut, clk = build_dut()
+    waves = waveform(clk, "hier_registered", start=False)
+    waves.add_signal(dut.a, group="A")
+    waves.add_hierarchy(dut, pattern="[ab]", recursive=False)
+    waves.add_hierarchy(dut, pattern="[ab]", recursive=False)
+    assert names(waves.waves["signal"][1:]) == [["A", "a"], ["top", "b"]]
+    assert len(waves.handles) == 3